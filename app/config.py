@@ -5,13 +5,18 @@ Central location for all app configuration.
 
 import os
 from pathlib import Path
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
+from app.utils.constants import GIFT_STATUSES  # single source of the status workflow
 
 # Base paths
 BASE_DIR = Path(__file__).parent.parent
+
+# Load environment variables from .env when there is one; real environment
+# variables still win (override=False). Without a .env, dotenv is never imported.
+ENV_FILE = BASE_DIR / ".env"
+if ENV_FILE.exists():
+    from dotenv import load_dotenv
+    load_dotenv(ENV_FILE, override=False)
+
 DATA_DIR = BASE_DIR / "data"
 DATA_DIR.mkdir(exist_ok=True)
 
@@ -20,13 +25,19 @@ DATABASE_URL = os.getenv("DATABASE_URL", f"sqlite:///{DATA_DIR}/holiday_gifts.db
 
 # Security
 SECRET_KEY = os.getenv("SECRET_KEY", "development-secret-key-change-this")
+MAX_LOGIN_ATTEMPTS = 5  # Failed logins before bcrypt checks are paused
+LOGIN_LOCKOUT_SECONDS = 60
+# bcrypt cost factor: each +1 doubles hashing time (10 ~ 50ms, 12 ~ 200ms, 13 ~ 400ms)
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "10"))
+
+# AI suggestions (optional; users can also paste a key into the session)
+ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
 
 # Application
 APP_NAME = os.getenv("APP_NAME", "Holiday Gifting Dashboard")
 DEBUG = os.getenv("DEBUG", "false").lower() == "true"
 
-# Status workflow
-GIFT_STATUSES = ["considering", "acquired", "wrapped", "given"]
+# Status workflow (GIFT_STATUSES is imported from app.utils.constants)
 STATUS_COLORS = {
     "considering": {"bg": "#F3F4F6", "fg": "#6B7280", "emoji": "🤔"},
     "acquired": {"bg": "#DBEAFE", "fg": "#2563EB", "emoji": "✓"},
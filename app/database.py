@@ -4,69 +4,102 @@ Investigator: Clive
 Case File: Database Operations
 """
 
-import os
-from pathlib import Path
-from sqlalchemy import create_engine, inspect
-from sqlalchemy.orm import sessionmaker, Session
+from contextlib import contextmanager
+from typing import Iterator
+import streamlit as st
+from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker, scoped_session, Session
 from sqlalchemy.pool import StaticPool
+from app.config import DATABASE_URL
 from app.models import Base
 
-# Get database URL from environment or use default
-DATABASE_URL = os.getenv(
-    "DATABASE_URL",
-    f"sqlite:///{Path(__file__).parent.parent / 'data' / 'holiday_gifts.db'}"
-)
-
-# Configure engine based on database type
-if DATABASE_URL.startswith("sqlite"):
-    # SQLite configuration for development
-    engine = create_engine(
-        DATABASE_URL,
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
-        echo=False  # Set to True for SQL debugging
-    )
-else:
-    # PostgreSQL or other database configuration
-    engine = create_engine(
-        DATABASE_URL,
-        echo=False,
-        pool_pre_ping=True
-    )
-
-# Create session factory
-SessionLocal = sessionmaker(
-    autocommit=False,
-    autoflush=False,
-    bind=engine
-)
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Tune the shared SQLite connection so its page cache stays hot across reruns."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA cache_size=-65536")  # 64 MB
+    cursor.close()
+
+
+@st.cache_resource
+def get_engine(database_url: str = DATABASE_URL) -> Engine:
+    """Get the process-wide engine for a database URL (created on first use)."""
+    # Configure engine based on database type
+    if database_url.startswith("sqlite"):
+        # SQLite configuration for development
+        engine = create_engine(
+            database_url,
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+            echo=False  # Set to True for SQL debugging
+        )
+        event.listen(engine, "connect", _set_sqlite_pragmas)
+    else:
+        # PostgreSQL or other database configuration
+        engine = create_engine(
+            database_url,
+            echo=False,
+            pool_size=10,
+            max_overflow=20,
+            pool_pre_ping=True,
+            pool_recycle=1800
+        )
+    return engine
+
+
+@st.cache_resource
+def get_session_factory(database_url: str = DATABASE_URL) -> scoped_session:
+    """Get the session factory (one session per thread, i.e. per Streamlit script run)."""
+    return scoped_session(sessionmaker(
+        autocommit=False,
+        autoflush=False,
+        bind=get_engine(database_url)
+    ))
 
 
 def init_db():
     """Initialize the database - create all tables."""
-    Base.metadata.create_all(bind=engine)
+    Base.metadata.create_all(bind=get_engine())
     print("Database initialized successfully.")
 
 
+@contextmanager
+def session_scope() -> Iterator[Session]:
+    """Provide a database session for a unit of work and release it afterwards."""
+    session_factory = get_session_factory()
+    db = session_factory()
+    try:
+        yield db
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        session_factory.remove()
+
+
 def get_db() -> Session:
     """Get a database session."""
-    return SessionLocal()
+    return get_session_factory()()
 
 
 def close_db(db: Session):
     """Close a database session."""
     if db:
-        db.close()
+        get_session_factory().remove()
 
 
 def table_exists(table_name: str) -> bool:
     """Check if a table exists in the database."""
-    inspector = inspect(engine)
+    inspector = inspect(get_engine())
     return table_name in inspector.get_table_names()
 
 
 def reset_db():
     """Drop all tables and recreate them. WARNING: Destructive operation."""
-    Base.metadata.drop_all(bind=engine)
+    Base.metadata.drop_all(bind=get_engine())
     init_db()
     print("Database reset complete.")
@@ -6,10 +6,10 @@ Case File: Database Schema
 
 from datetime import datetime
 from typing import Optional, List
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text, Index, func
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship as sa_relationship
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 # SQLAlchemy ORM Setup
 Base = declarative_base()
@@ -23,7 +23,7 @@ class User(Base):
     email = Column(String(255), unique=True, nullable=False, index=True)
     name = Column(String(255), nullable=False)
     password_hash = Column(String(255), nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
 
     # Relationships
     giftees = sa_relationship("Giftee", back_populates="user", cascade="all, delete-orphan")
@@ -37,16 +37,22 @@ class Giftee(Base):
     __tablename__ = "giftees"
 
     id = Column(Integer, primary_key=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     name = Column(String(255), nullable=False)
     relationship = Column(String(100), nullable=True)  # Partner, Parent, Friend, etc.
     budget = Column(Float, nullable=True)
     notes = Column(Text, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
 
     # Relationships
     user = sa_relationship("User", back_populates="giftees")
-    gifts = sa_relationship("GiftIdea", back_populates="giftee", cascade="all, delete-orphan")
+    gifts = sa_relationship(
+        "GiftIdea",
+        back_populates="giftee",
+        cascade="all, delete-orphan",
+        order_by="GiftIdea.rank",
+        lazy="selectin"  # One IN query per batch of giftees, never one per giftee
+    )
 
     def __repr__(self):
         return f"<Giftee(id={self.id}, name='{self.name}', user_id={self.user_id})>"
@@ -55,6 +61,12 @@ class Giftee(Base):
 class GiftIdea(Base):
     """Gift idea for a giftee."""
     __tablename__ = "gift_ideas"
+    __table_args__ = (
+        # Leading giftee_id also serves plain per-giftee lookups
+        Index("ix_gift_ideas_giftee_id_status", "giftee_id", "status"),
+        # Per-giftee lists come back already in rank order, no sort step
+        Index("ix_gift_ideas_giftee_id_rank", "giftee_id", "rank"),
+    )
 
     id = Column(Integer, primary_key=True)
     giftee_id = Column(Integer, ForeignKey("giftees.id"), nullable=False)
@@ -64,7 +76,7 @@ class GiftIdea(Base):
     price = Column(Float, nullable=True)
     rank = Column(Integer, default=1, nullable=False)  # 1 = top choice
     status = Column(String(20), default="considering", nullable=False)  # considering, acquired, wrapped, given
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
 
     # Relationships
     giftee = sa_relationship("Giftee", back_populates="gifts")
@@ -91,8 +103,7 @@ class UserRead(UserBase):
     id: int
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class GifteeBase(BaseModel):
@@ -119,8 +130,7 @@ class GifteeRead(GifteeBase):
     user_id: int
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class GiftIdeaBase(BaseModel):
@@ -154,13 +164,9 @@ class GiftIdeaRead(GiftIdeaBase):
     giftee_id: int
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class GifteeWithGifts(GifteeRead):
     """Giftee with all their gift ideas."""
     gifts: List[GiftIdeaRead] = []
-
-    class Config:
-        from_attributes = True
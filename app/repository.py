@@ -4,19 +4,28 @@ Investigator: Clive
 Case File: Data Access
 """
 
-from typing import List, Optional
-from sqlalchemy.orm import Session
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import bindparam, exists, func, select, update
+from sqlalchemy.orm import Session, lazyload, selectinload
+from app.config import BCRYPT_ROUNDS
 from app.models import User, Giftee, GiftIdea
 import bcrypt
 
 
+# Hot single-row lookups, built once; SQLAlchemy caches their compiled SQL.
+# Primary-key lookups use db.get() instead, which skips SQL on an identity-map hit.
+_USER_BY_EMAIL = select(User).where(User.email == bindparam("email"))
+_USER_EXISTS = select(exists().where(User.email == bindparam("email")))
+
+
 class UserRepository:
     """User data access operations."""
 
     @staticmethod
     def create_user(db: Session, email: str, name: str, password: str) -> User:
         """Create a new user."""
-        password_hash = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        password_hash = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode('utf-8')
         user = User(email=email, name=name, password_hash=password_hash)
         db.add(user)
         db.commit()
@@ -26,22 +35,35 @@ class UserRepository:
     @staticmethod
     def get_user_by_email(db: Session, email: str) -> Optional[User]:
         """Get user by email."""
-        return db.query(User).filter(User.email == email).first()
+        return db.execute(_USER_BY_EMAIL, {"email": email}).scalar_one_or_none()
 
     @staticmethod
     def get_user_by_id(db: Session, user_id: int) -> Optional[User]:
         """Get user by ID."""
-        return db.query(User).filter(User.id == user_id).first()
+        return db.get(User, user_id)
 
     @staticmethod
     def verify_password(password: str, password_hash: str) -> bool:
-        """Verify password against hash."""
+        """
+        Verify password against hash.
+
+        bcrypt releases the GIL while hashing, and Streamlit runs each session's
+        script on its own thread, so concurrent logins already hash in parallel.
+        """
         return bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('utf-8'))
 
+    @staticmethod
+    def verify_many(pairs: List[Tuple[str, str]]) -> List[bool]:
+        """Verify many (password, password_hash) pairs in parallel, e.g. for bulk imports."""
+        if not pairs:
+            return []
+        with ThreadPoolExecutor() as executor:
+            return list(executor.map(lambda pair: UserRepository.verify_password(*pair), pairs))
+
     @staticmethod
     def user_exists(db: Session, email: str) -> bool:
         """Check if user exists."""
-        return db.query(User).filter(User.email == email).first() is not None
+        return db.execute(_USER_EXISTS, {"email": email}).scalar()
 
 
 class GifteeRepository:
@@ -72,33 +94,53 @@ class GifteeRepository:
     @staticmethod
     def get_giftee_by_id(db: Session, giftee_id: int) -> Optional[Giftee]:
         """Get giftee by ID."""
-        return db.query(Giftee).filter(Giftee.id == giftee_id).first()
+        return db.get(Giftee, giftee_id)
 
     @staticmethod
     def get_user_giftees(db: Session, user_id: int) -> List[Giftee]:
         """Get all giftees for a user."""
         return db.query(Giftee).filter(Giftee.user_id == user_id).all()
 
+    @staticmethod
+    def get_user_giftees_with_gifts(db: Session, user_id: int) -> List[Giftee]:
+        """Get all giftees for a user with their gifts loaded in one extra query."""
+        return db.query(Giftee).options(selectinload(Giftee.gifts)).filter(
+            Giftee.user_id == user_id
+        ).order_by(Giftee.id).all()
+
     @staticmethod
     def update_giftee(
         db: Session,
         giftee_id: int,
+        *,
+        return_obj: bool = True,
         **kwargs
     ) -> Optional[Giftee]:
-        """Update giftee details."""
-        giftee = db.query(Giftee).filter(Giftee.id == giftee_id).first()
-        if giftee:
-            for key, value in kwargs.items():
-                if hasattr(giftee, key) and value is not None:
-                    setattr(giftee, key, value)
-            db.commit()
-            db.refresh(giftee)
+        """Update giftee details with a single UPDATE ... RETURNING; return_obj=False skips RETURNING."""
+        values = {
+            key: value for key, value in kwargs.items()
+            if key in Giftee.__table__.columns and value is not None
+        }
+        if not values:
+            return db.get(Giftee, giftee_id) if return_obj else None
+        stmt = update(Giftee).where(Giftee.id == giftee_id).values(values)
+        if return_obj:
+            # UPDATE ... RETURNING hands back the row in the same round trip;
+            # populate_existing refreshes a giftee already held by the session, and
+            # lazyload defers the eager gifts SELECT until .gifts is actually read
+            giftee = db.scalars(
+                stmt.returning(Giftee).options(lazyload("*")), execution_options={"populate_existing": True}
+            ).one_or_none()
+        else:
+            db.execute(stmt)
+            giftee = None
+        db.commit()
         return giftee
 
     @staticmethod
     def delete_giftee(db: Session, giftee_id: int) -> bool:
         """Delete a giftee and their gifts."""
-        giftee = db.query(Giftee).filter(Giftee.id == giftee_id).first()
+        giftee = db.get(Giftee, giftee_id)
         if giftee:
             db.delete(giftee)
             db.commit()
@@ -108,8 +150,9 @@ class GifteeRepository:
     @staticmethod
     def get_total_budget(db: Session, user_id: int) -> float:
         """Get total budget for all giftees."""
-        giftees = GifteeRepository.get_user_giftees(db, user_id)
-        return sum(g.budget for g in giftees if g.budget is not None)
+        return db.query(func.coalesce(func.sum(Giftee.budget), 0.0)).filter(
+            Giftee.user_id == user_id
+        ).scalar()
 
 
 class GiftIdeaRepository:
@@ -141,10 +184,18 @@ class GiftIdeaRepository:
         db.refresh(gift)
         return gift
 
+    @staticmethod
+    def create_gift_ideas_bulk(db: Session, giftee_id: int, ideas: List[Dict]) -> List[GiftIdea]:
+        """Create several gift ideas for a giftee in a single transaction."""
+        gifts = [GiftIdea(giftee_id=giftee_id, **idea) for idea in ideas]
+        db.add_all(gifts)
+        db.commit()
+        return gifts
+
     @staticmethod
     def get_gift_by_id(db: Session, gift_id: int) -> Optional[GiftIdea]:
         """Get gift idea by ID."""
-        return db.query(GiftIdea).filter(GiftIdea.id == gift_id).first()
+        return db.get(GiftIdea, gift_id)
 
     @staticmethod
     def get_giftee_gifts(db: Session, giftee_id: int) -> List[GiftIdea]:
@@ -157,22 +208,34 @@ class GiftIdeaRepository:
     def update_gift(
         db: Session,
         gift_id: int,
+        *,
+        return_obj: bool = True,
         **kwargs
     ) -> Optional[GiftIdea]:
-        """Update gift idea details."""
-        gift = db.query(GiftIdea).filter(GiftIdea.id == gift_id).first()
-        if gift:
-            for key, value in kwargs.items():
-                if hasattr(gift, key) and value is not None:
-                    setattr(gift, key, value)
-            db.commit()
-            db.refresh(gift)
+        """Update gift idea details with a single UPDATE ... RETURNING; return_obj=False skips RETURNING."""
+        values = {
+            key: value for key, value in kwargs.items()
+            if key in GiftIdea.__table__.columns and value is not None
+        }
+        if not values:
+            return db.get(GiftIdea, gift_id) if return_obj else None
+        stmt = update(GiftIdea).where(GiftIdea.id == gift_id).values(values)
+        if return_obj:
+            # UPDATE ... RETURNING hands back the row in the same round trip;
+            # populate_existing refreshes a gift already held by the session
+            gift = db.scalars(
+                stmt.returning(GiftIdea), execution_options={"populate_existing": True}
+            ).one_or_none()
+        else:
+            db.execute(stmt)
+            gift = None
+        db.commit()
         return gift
 
     @staticmethod
     def delete_gift(db: Session, gift_id: int) -> bool:
         """Delete a gift idea."""
-        gift = db.query(GiftIdea).filter(GiftIdea.id == gift_id).first()
+        gift = db.get(GiftIdea, gift_id)
         if gift:
             db.delete(gift)
             db.commit()
@@ -180,22 +243,34 @@ class GiftIdeaRepository:
         return False
 
     @staticmethod
-    def update_gift_status(db: Session, gift_id: int, status: str) -> Optional[GiftIdea]:
+    def update_gift_status(
+        db: Session,
+        gift_id: int,
+        status: str,
+        return_obj: bool = True
+    ) -> Optional[GiftIdea]:
         """Update gift status."""
-        return GiftIdeaRepository.update_gift(db, gift_id, status=status)
+        return GiftIdeaRepository.update_gift(db, gift_id, return_obj=return_obj, status=status)
 
     @staticmethod
     def get_giftee_total_cost(db: Session, giftee_id: int) -> float:
         """Get total cost of acquired gifts for a giftee."""
-        gifts = GiftIdeaRepository.get_giftee_gifts(db, giftee_id)
-        acquired_gifts = [g for g in gifts if g.status in ["acquired", "wrapped", "given"]]
-        return sum(g.price for g in acquired_gifts if g.price is not None)
+        return db.query(func.coalesce(func.sum(GiftIdea.price), 0.0)).filter(
+            GiftIdea.giftee_id == giftee_id,
+            GiftIdea.status.in_(("acquired", "wrapped", "given"))
+        ).scalar()
 
     @staticmethod
     def get_user_all_gifts(db: Session, user_id: int) -> List[GiftIdea]:
-        """Get all gifts for all giftees of a user."""
-        giftees = db.query(Giftee).filter(Giftee.user_id == user_id).all()
-        all_gifts = []
-        for giftee in giftees:
-            all_gifts.extend(GiftIdeaRepository.get_giftee_gifts(db, giftee.id))
-        return all_gifts
+        """Get all gifts for all giftees of a user, grouped by giftee and ordered by rank."""
+        return db.query(GiftIdea).join(Giftee, GiftIdea.giftee_id == Giftee.id).filter(
+            Giftee.user_id == user_id
+        ).order_by(GiftIdea.giftee_id, GiftIdea.rank).all()
+
+    @staticmethod
+    def get_user_status_counts(db: Session, user_id: int) -> Dict[str, int]:
+        """Get the number of gifts in each status across all giftees of a user."""
+        rows = db.query(GiftIdea.status, func.count(GiftIdea.id)).join(Giftee).filter(
+            Giftee.user_id == user_id
+        ).group_by(GiftIdea.status).all()
+        return dict(rows)
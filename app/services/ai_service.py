@@ -4,7 +4,8 @@ Based on prompts engineered by Clive
 """
 
 import os
-from typing import Optional, List, Dict, Any
+import re
+from typing import Optional, List, Dict, Any, Tuple, Callable
 from enum import Enum
 
 try:
@@ -14,6 +15,33 @@ except ImportError:
     ANTHROPIC_AVAILABLE = False
 
 
+# Classifies one response line; the matching group's name is the idea field it sets
+_LINE_RE = re.compile(
+    r"(?P<title>\*\*.*(?<=\*\*))$"  # **Gift Title**
+    r"|(?P<numbered>\d.?\.)"       # 1. Gift Title
+    r"|(?P<description>description:)"
+    r"|(?P<why_it_fits>why it fits:)"
+    r"|(?P<price_range>price(?: range)?:)",
+    re.IGNORECASE
+)
+
+
+# Advisor instructions shared by every scenario, sent as the system prompt
+SYSTEM_CONTEXT = """You are a thoughtful gift advisor helping someone find meaningful gifts.
+Your suggestions should be:
+- Specific and actionable (not generic)
+- Thoughtfully matched to the person's interests and context
+- Practical and actually available for purchase or creation
+- Include clear reasoning for why each gift fits
+
+Format each suggestion as:
+**[Gift Title]**
+Description: [One sentence description]
+Why It Fits: [Specific reasoning about THIS person]
+Price Range: [Estimated cost]
+"""
+
+
 class GiftScenario(Enum):
     """Gift brainstorming scenarios."""
     GENERAL = "general"
@@ -26,6 +54,139 @@ class GiftScenario(Enum):
     LUXURY = "luxury"
 
 
+# Per-scenario user prompt templates and their context defaults
+SCENARIO_PROMPTS: Dict[GiftScenario, Tuple[str, Dict[str, str]]] = {
+    GiftScenario.GENERAL: ("""Generate {num_ideas} thoughtful gift ideas for {giftee_name}, who is a {relationship}.
+
+Context:
+- Budget: {budget}
+- Interests/hobbies: {interests}
+- Gift preferences: {gift_preferences}
+- Any additional notes: {notes}
+
+Focus on gifts that show you understand what matters to them.""",
+        {"gift_preferences": "Open to suggestions", "notes": "None"}),
+
+    GiftScenario.BUDGET: ("""Generate {num_ideas} budget-conscious but thoughtful gift ideas for {giftee_name}, who is a {relationship}.
+
+Context:
+- Budget: {budget}
+- What matters most to them: {values}
+- Interests: {interests}
+
+Focus on creative, meaningful gifts that maximize thoughtfulness over cost.""",
+        {"values": "Not specified"}),
+
+    GiftScenario.LAST_MINUTE: ("""Generate {num_ideas} last-minute gift ideas for {giftee_name}, who is a {relationship}.
+
+Context:
+- Time available: {days_until_event} days
+- Budget: {budget}
+- Interests: {interests}
+- Can shop online or in-person: {shopping_method}
+
+Focus on gifts that can be obtained quickly but still feel thoughtful.""",
+        {"days_until_event": "3-5", "shopping_method": "both"}),
+
+    GiftScenario.DIY: ("""Generate {num_ideas} DIY/personalized gift ideas for {giftee_name}, who is a {relationship}.
+
+Context:
+- Your skills: {your_skills}
+- Time available: {time_available}
+- Budget for supplies: {budget}
+- Their interests: {interests}
+
+Focus on gifts you can create or personalize yourself.""",
+        {"your_skills": "Basic crafting", "time_available": "A few hours"}),
+
+    GiftScenario.LUXURY: ("""Generate {num_ideas} luxury/high-end gift ideas for {giftee_name}, who is a {relationship}.
+
+Context:
+- Budget: {budget}
+- Their values: {values}
+- Interests: {interests}
+- Priority: {priority}
+
+Focus on exceptional quality, experiences, or items they wouldn't buy themselves.""",
+        {"values": "Quality and craftsmanship", "priority": "Quality over quantity"}),
+
+    GiftScenario.EXPERIENCE: ("""Generate {num_ideas} gift ideas for {giftee_name}, including both experience and physical options.
+
+Context:
+- Budget: {budget}
+- Energy level preference: {energy_level}
+- Interests: {interests}
+- Logistics: {logistics}
+
+Include a mix of experiences and physical gifts so they can compare.""",
+        {"energy_level": "Mixed", "logistics": "Flexible"}),
+
+    GiftScenario.GROUP: ("""Generate {num_ideas} gift ideas that would complement a group gift for {giftee_name}, who is a {relationship}.
+
+Context:
+- Main gift from group: {main_gift}
+- Your contribution budget: {budget}
+- Their interests: {interests}
+
+Focus on gifts that complement or enhance the main gift.""",
+        {"main_gift": "Not specified"}),
+
+    GiftScenario.MINIMAL: ("""Generate {num_ideas} thoughtful gift ideas for {giftee_name}, who is a {relationship}.
+
+I don't know them very well, so suggest safe, universally appreciated gifts that work for a {relationship}.
+
+Budget: {budget}
+
+Focus on reliable, well-received gifts appropriate for this relationship.""",
+        {}),
+}
+
+
+# Scenario choices for the UI, built once at import
+AVAILABLE_SCENARIOS = (
+    {
+        "value": GiftScenario.GENERAL.value,
+        "label": "General Brainstorming",
+        "description": "Standard gift brainstorming with full context"
+    },
+    {
+        "value": GiftScenario.BUDGET.value,
+        "label": "Budget-Conscious",
+        "description": "Thoughtful gifts on a tight budget"
+    },
+    {
+        "value": GiftScenario.LAST_MINUTE.value,
+        "label": "Last-Minute",
+        "description": "Quick gifts available now"
+    },
+    {
+        "value": GiftScenario.DIY.value,
+        "label": "DIY/Personalized",
+        "description": "Gifts you can create yourself"
+    },
+    {
+        "value": GiftScenario.LUXURY.value,
+        "label": "Luxury/High-End",
+        "description": "Premium, exceptional quality gifts"
+    },
+    {
+        "value": GiftScenario.EXPERIENCE.value,
+        "label": "Experience vs Physical",
+        "description": "Compare experience and physical gift options"
+    },
+    {
+        "value": GiftScenario.GROUP.value,
+        "label": "Group Gift Addition",
+        "description": "Complement a group gift"
+    },
+    {
+        "value": GiftScenario.MINIMAL.value,
+        "label": "Minimal Information",
+        "description": "Safe bets when you don't know them well"
+    }
+)
+
+
 class GiftBrainstormingService:
     """
     Claude API service for AI-powered gift suggestions.
@@ -59,7 +220,8 @@ class GiftBrainstormingService:
         scenario: GiftScenario,
         giftee_name: str,
         context: Dict[str, Any],
-        num_ideas: int = 5
+        num_ideas: int = 5,
+        on_text: Optional[Callable[[str], None]] = None
     ) -> Dict[str, Any]:
         """
         Generate AI-powered gift suggestions.
@@ -74,6 +236,8 @@ class GiftBrainstormingService:
                 - gift_preferences: str (optional)
                 - Additional scenario-specific fields
             num_ideas: Number of gift ideas to generate (1-10)
+            on_text: Optional callback; if given, the response is streamed and
+                each text chunk is passed to it as it arrives
 
         Returns:
             Dictionary with:
@@ -100,17 +264,32 @@ class GiftBrainstormingService:
             # Get scenario-specific prompt
             prompt = self._build_prompt(scenario, giftee_name, context, num_ideas)
 
-            # Call Claude API
-            message = self.client.messages.create(
+            request = dict(
                 model="claude-3-5-haiku-20241022",
-                max_tokens=1000,
+                # ~150 tokens per idea in the requested format, plus room for a preamble
+                max_tokens=min(1000, 150 + 150 * num_ideas),
                 temperature=0.7,
+                # Identical on every call; cached once it passes the model's minimum length
+                system=[{
+                    "type": "text",
+                    "text": SYSTEM_CONTEXT,
+                    "cache_control": {"type": "ephemeral"}
+                }],
                 messages=[{
                     "role": "user",
                     "content": prompt
                 }]
             )
 
+            # Call Claude API
+            if on_text is None:
+                message = self.client.messages.create(**request)
+            else:
+                with self.client.messages.stream(**request) as stream:
+                    for text in stream.text_stream:
+                        on_text(text)
+                    message = stream.get_final_message()
+
             # Parse response
             ideas = self._parse_response(message.content[0].text)
 
@@ -153,131 +332,19 @@ class GiftBrainstormingService:
         num_ideas: int
     ) -> str:
         """Build scenario-specific prompt."""
-
-        # Base system context
-        system_context = """You are a thoughtful gift advisor helping someone find meaningful gifts.
-Your suggestions should be:
-- Specific and actionable (not generic)
-- Thoughtfully matched to the person's interests and context
-- Practical and actually available for purchase or creation
-- Include clear reasoning for why each gift fits
-
-Format each suggestion as:
-**[Gift Title]**
-Description: [One sentence description]
-Why It Fits: [Specific reasoning about THIS person]
-Price Range: [Estimated cost]
-"""
-
-        # Get relationship and budget from context
-        relationship = context.get("relationship", "someone special")
-        budget = context.get("budget", "no specific budget")
-        interests = context.get("interests", "")
-
-        # Build scenario-specific prompt
-        if scenario == GiftScenario.GENERAL:
-            prompt = f"""{system_context}
-
-Generate {num_ideas} thoughtful gift ideas for {giftee_name}, who is a {relationship}.
-
-Context:
-- Budget: {budget}
-- Interests/hobbies: {interests or 'Not specified'}
-- Gift preferences: {context.get('gift_preferences', 'Open to suggestions')}
-- Any additional notes: {context.get('notes', 'None')}
-
-Focus on gifts that show you understand what matters to them."""
-
-        elif scenario == GiftScenario.BUDGET:
-            prompt = f"""{system_context}
-
-Generate {num_ideas} budget-conscious but thoughtful gift ideas for {giftee_name}, who is a {relationship}.
-
-Context:
-- Budget: {budget}
-- What matters most to them: {context.get('values', 'Not specified')}
-- Interests: {interests or 'Not specified'}
-
-Focus on creative, meaningful gifts that maximize thoughtfulness over cost."""
-
-        elif scenario == GiftScenario.LAST_MINUTE:
-            days_left = context.get('days_until_event', '3-5')
-            prompt = f"""{system_context}
-
-Generate {num_ideas} last-minute gift ideas for {giftee_name}, who is a {relationship}.
-
-Context:
-- Time available: {days_left} days
-- Budget: {budget}
-- Interests: {interests or 'Not specified'}
-- Can shop online or in-person: {context.get('shopping_method', 'both')}
-
-Focus on gifts that can be obtained quickly but still feel thoughtful."""
-
-        elif scenario == GiftScenario.DIY:
-            prompt = f"""{system_context}
-
-Generate {num_ideas} DIY/personalized gift ideas for {giftee_name}, who is a {relationship}.
-
-Context:
-- Your skills: {context.get('your_skills', 'Basic crafting')}
-- Time available: {context.get('time_available', 'A few hours')}
-- Budget for supplies: {budget}
-- Their interests: {interests or 'Not specified'}
-
-Focus on gifts you can create or personalize yourself."""
-
-        elif scenario == GiftScenario.LUXURY:
-            prompt = f"""{system_context}
-
-Generate {num_ideas} luxury/high-end gift ideas for {giftee_name}, who is a {relationship}.
-
-Context:
-- Budget: {budget}
-- Their values: {context.get('values', 'Quality and craftsmanship')}
-- Interests: {interests or 'Not specified'}
-- Priority: {context.get('priority', 'Quality over quantity')}
-
-Focus on exceptional quality, experiences, or items they wouldn't buy themselves."""
-
-        elif scenario == GiftScenario.EXPERIENCE:
-            prompt = f"""{system_context}
-
-Generate {num_ideas} gift ideas for {giftee_name}, including both experience and physical options.
-
-Context:
-- Budget: {budget}
-- Energy level preference: {context.get('energy_level', 'Mixed')}
-- Interests: {interests or 'Not specified'}
-- Logistics: {context.get('logistics', 'Flexible')}
-
-Include a mix of experiences and physical gifts so they can compare."""
-
-        elif scenario == GiftScenario.GROUP:
-            main_gift = context.get('main_gift', 'Not specified')
-            prompt = f"""{system_context}
-
-Generate {num_ideas} gift ideas that would complement a group gift for {giftee_name}, who is a {relationship}.
-
-Context:
-- Main gift from group: {main_gift}
-- Your contribution budget: {budget}
-- Their interests: {interests or 'Not specified'}
-
-Focus on gifts that complement or enhance the main gift."""
-
-        else:  # MINIMAL
-            prompt = f"""{system_context}
-
-Generate {num_ideas} thoughtful gift ideas for {giftee_name}, who is a {relationship}.
-
-I don't know them very well, so suggest safe, universally appreciated gifts that work for a {relationship}.
-
-Budget: {budget}
-
-Focus on reliable, well-received gifts appropriate for this relationship."""
-
-        return prompt
+        template, defaults = SCENARIO_PROMPTS.get(scenario, SCENARIO_PROMPTS[GiftScenario.MINIMAL])
+        fields = {
+            "relationship": "someone special",
+            "budget": "no specific budget",
+            **defaults,
+            **context,
+        }
+        fields.update(
+            num_ideas=num_ideas,
+            giftee_name=giftee_name,
+            interests=context.get("interests") or "Not specified",
+        )
+        return template.format(**fields)
 
     def _parse_response(self, response_text: str) -> List[Dict[str, str]]:
         """
@@ -304,34 +371,19 @@ Focus on reliable, well-received gifts appropriate for this relationship."""
                     current_idea = {}
                 continue
 
-            # Check for title (usually bold with **)
-            if line.startswith('**') and line.endswith('**'):
-                # Save previous idea if exists
-                if current_idea and 'title' in current_idea:
-                    ideas.append(current_idea)
-                # Start new idea
-                current_idea = {'title': line.strip('*').strip()}
+            match = _LINE_RE.match(line)
+            if not match:
+                continue
 
-            # Check for numbered title (1., 2., etc.)
-            elif line[0].isdigit() and '.' in line[:3]:
-                # Save previous idea
+            field = match.lastgroup
+            if field in ('title', 'numbered'):
+                # Save previous idea and start a new one
                 if current_idea and 'title' in current_idea:
                     ideas.append(current_idea)
-                # Extract title
-                title = line.split('.', 1)[1].strip()
-                current_idea = {'title': title.strip('*').strip()}
-
-            # Check for description
-            elif line.lower().startswith('description:'):
-                current_idea['description'] = line.split(':', 1)[1].strip()
-
-            # Check for why it fits
-            elif line.lower().startswith('why it fits:'):
-                current_idea['why_it_fits'] = line.split(':', 1)[1].strip()
-
-            # Check for price range
-            elif line.lower().startswith('price range:') or line.lower().startswith('price:'):
-                current_idea['price_range'] = line.split(':', 1)[1].strip()
+                title = line if field == 'title' else line.split('.', 1)[1]
+                current_idea = {'title': title.strip().strip('*').strip()}
+            else:
+                current_idea[field] = line.split(':', 1)[1].strip()
 
         # Don't forget the last idea
         if current_idea and 'title' in current_idea:
@@ -347,45 +399,4 @@ Focus on reliable, well-received gifts appropriate for this relationship."""
 
     def get_available_scenarios(self) -> List[Dict[str, str]]:
         """Get list of available brainstorming scenarios."""
-        return [
-            {
-                "value": GiftScenario.GENERAL.value,
-                "label": "General Brainstorming",
-                "description": "Standard gift brainstorming with full context"
-            },
-            {
-                "value": GiftScenario.BUDGET.value,
-                "label": "Budget-Conscious",
-                "description": "Thoughtful gifts on a tight budget"
-            },
-            {
-                "value": GiftScenario.LAST_MINUTE.value,
-                "label": "Last-Minute",
-                "description": "Quick gifts available now"
-            },
-            {
-                "value": GiftScenario.DIY.value,
-                "label": "DIY/Personalized",
-                "description": "Gifts you can create yourself"
-            },
-            {
-                "value": GiftScenario.LUXURY.value,
-                "label": "Luxury/High-End",
-                "description": "Premium, exceptional quality gifts"
-            },
-            {
-                "value": GiftScenario.EXPERIENCE.value,
-                "label": "Experience vs Physical",
-                "description": "Compare experience and physical gift options"
-            },
-            {
-                "value": GiftScenario.GROUP.value,
-                "label": "Group Gift Addition",
-                "description": "Complement a group gift"
-            },
-            {
-                "value": GiftScenario.MINIMAL.value,
-                "label": "Minimal Information",
-                "description": "Safe bets when you don't know them well"
-            }
-        ]
+        return list(AVAILABLE_SCENARIOS)
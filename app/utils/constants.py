@@ -5,7 +5,7 @@ Case File: Application Constants
 """
 
 # Status progression
-GIFT_STATUSES = ["considering", "acquired", "wrapped", "given"]
+GIFT_STATUSES = ("considering", "acquired", "wrapped", "given")
 
 STATUS_COLORS = {
     "considering": {"bg": "#F3F4F6", "fg": "#6B7280", "emoji": "🤔"},
@@ -14,6 +14,22 @@ STATUS_COLORS = {
     "given": {"bg": "#D1FAE5", "fg": "#059669", "emoji": "🎉"}
 }
 
+# Status badges (emoji + label), rendered once at import
+STATUS_BADGES = {
+    status: f"{colors['emoji']} {status.capitalize()}"
+    for status, colors in STATUS_COLORS.items()
+}
+
+# Workflow neighbours of each status (wrapping at both ends)
+NEXT_STATUS = {
+    status: GIFT_STATUSES[(i + 1) % len(GIFT_STATUSES)]
+    for i, status in enumerate(GIFT_STATUSES)
+}
+PREVIOUS_STATUS = {
+    status: GIFT_STATUSES[i - 1]
+    for i, status in enumerate(GIFT_STATUSES)
+}
+
 # Relationships (for dropdown)
 RELATIONSHIPS = [
     "Partner",
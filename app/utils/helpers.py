@@ -4,43 +4,30 @@ Investigator: Clive
 Case File: Utility Functions
 """
 
+from collections import Counter
 from typing import List, Dict, Any
-import streamlit as st
-from app.utils.constants import STATUS_COLORS, GIFT_STATUSES
+from app.utils.constants import (
+    STATUS_COLORS, STATUS_BADGES, GIFT_STATUSES, NEXT_STATUS, PREVIOUS_STATUS
+)
 
 def get_next_status(current_status: str) -> str:
     """Advance to next status in workflow."""
-    try:
-        current_index = GIFT_STATUSES.index(current_status)
-        next_index = (current_index + 1) % len(GIFT_STATUSES)
-        return GIFT_STATUSES[next_index]
-    except ValueError:
-        return GIFT_STATUSES[0]
+    return NEXT_STATUS.get(current_status, GIFT_STATUSES[0])
 
 def get_previous_status(current_status: str) -> str:
     """Return to previous status in workflow."""
-    try:
-        current_index = GIFT_STATUSES.index(current_status)
-        prev_index = (current_index - 1) % len(GIFT_STATUSES)
-        return GIFT_STATUSES[prev_index]
-    except ValueError:
-        return GIFT_STATUSES[0]
+    return PREVIOUS_STATUS.get(current_status, GIFT_STATUSES[0])
 
 def calculate_progress(gifts: List[Dict[str, Any]]) -> Dict[str, Any]:
     """Calculate gift progress statistics."""
-    if not gifts:
-        return {
-            "total": 0,
-            "acquired": 0,
-            "wrapped": 0,
-            "given": 0,
-            "percentage": 0
-        }
-
-    total = len(gifts)
-    acquired = sum(1 for g in gifts if g.get("status") in ["acquired", "wrapped", "given"])
-    wrapped = sum(1 for g in gifts if g.get("status") in ["wrapped", "given"])
-    given = sum(1 for g in gifts if g.get("status") == "given")
+    return progress_from_counts(Counter(g.get("status") for g in gifts))
+
+def progress_from_counts(status_counts: Dict[str, int]) -> Dict[str, Any]:
+    """Calculate gift progress statistics from per-status gift counts."""
+    total = sum(status_counts.values())
+    given = status_counts.get("given", 0)
+    wrapped = status_counts.get("wrapped", 0) + given
+    acquired = status_counts.get("acquired", 0) + wrapped
 
     return {
         "total": total,
@@ -58,5 +45,7 @@ def format_currency(amount: float) -> str:
 
 def render_status_badge(status: str) -> str:
     """Render a status badge with appropriate styling."""
-    colors = STATUS_COLORS.get(status, STATUS_COLORS["considering"])
-    return f"{colors['emoji']} {status.capitalize()}"
+    badge = STATUS_BADGES.get(status)
+    if badge is None:
+        badge = f"{STATUS_COLORS['considering']['emoji']} {status.capitalize()}"
+    return badge
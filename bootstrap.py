@@ -4,12 +4,33 @@ Holiday Gifting Dashboard - Project Bootstrap Script
 Investigator: Clive
 Case: Rapid MVP Development
 Status: Ready for Execution
+
+Usage: python bootstrap.py [--force]
+(--force overwrites existing files that differ from the templates)
 """
 
 import os
 import sys
 from pathlib import Path
 
+# Existing files are never overwritten unless the script is run with --force
+FORCE = "--force" in sys.argv[1:]
+
+def write_file(path, content, mode=None):
+    """Write a generated file; existing files are left alone unless --force is given."""
+    target = Path(path)
+    if target.exists():
+        if target.read_text(encoding="utf-8") == content:
+            print(f"✓ Unchanged: {path}")
+            return
+        if not FORCE:
+            print(f"⚠️  Kept existing {path} (differs from template; use --force to overwrite)")
+            return
+    target.write_text(content, encoding="utf-8")
+    if mode is not None:
+        os.chmod(target, mode)
+    print(f"✓ Created {path}")
+
 def create_project_structure():
     """Create the complete project directory structure."""
 
@@ -26,10 +47,13 @@ def create_project_structure():
         ".streamlit"
     ]
 
-    # Create directories
+    # Create directories (listed parents-first, so no parents=True walk is needed)
     for directory in directories:
         path = base_path / directory
-        path.mkdir(parents=True, exist_ok=True)
+        if path.is_dir():
+            print(f"✓ Directory exists: {directory}")
+            continue
+        path.mkdir()
         print(f"✓ Created directory: {directory}")
 
     # Create __init__.py files for Python packages
@@ -41,6 +65,10 @@ def create_project_structure():
 
     for init_file in init_files:
         path = base_path / init_file
+        if path.exists():
+            # Leave existing files alone rather than touching their mtime
+            print(f"✓ File exists: {init_file}")
+            continue
         path.touch()
         print(f"✓ Created file: {init_file}")
 
@@ -57,9 +85,7 @@ pytest==7.4.3
 pytest-cov==4.1.0
 """
 
-    with open("requirements.txt", "w") as f:
-        f.write(requirements)
-    print("✓ Created requirements.txt")
+    write_file("requirements.txt", requirements)
 
 def create_env_example():
     """Create .env.example file."""
@@ -78,9 +104,7 @@ APP_NAME=Holiday Gifting Dashboard
 DEBUG=false
 """
 
-    with open(".env.example", "w") as f:
-        f.write(env_content)
-    print("✓ Created .env.example")
+    write_file(".env.example", env_content)
 
 def create_gitignore():
     """Create .gitignore file."""
@@ -123,9 +147,7 @@ htmlcov/
 *.log
 """
 
-    with open(".gitignore", "w") as f:
-        f.write(gitignore_content)
-    print("✓ Created .gitignore")
+    write_file(".gitignore", gitignore_content)
 
 def create_streamlit_config():
     """Create Streamlit configuration."""
@@ -144,9 +166,7 @@ headless = true
 gatherUsageStats = false
 """
 
-    with open(".streamlit/config.toml", "w") as f:
-        f.write(config_content)
-    print("✓ Created .streamlit/config.toml")
+    write_file(".streamlit/config.toml", config_content)
 
 def create_config_py():
     """Create configuration management file."""
@@ -158,13 +178,18 @@ Central location for all app configuration.
 
 import os
 from pathlib import Path
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
+from app.utils.constants import GIFT_STATUSES  # single source of the status workflow
 
 # Base paths
 BASE_DIR = Path(__file__).parent.parent
+
+# Load environment variables from .env when there is one; real environment
+# variables still win (override=False). Without a .env, dotenv is never imported.
+ENV_FILE = BASE_DIR / ".env"
+if ENV_FILE.exists():
+    from dotenv import load_dotenv
+    load_dotenv(ENV_FILE, override=False)
+
 DATA_DIR = BASE_DIR / "data"
 DATA_DIR.mkdir(exist_ok=True)
 
@@ -178,8 +203,7 @@ SECRET_KEY = os.getenv("SECRET_KEY", "development-secret-key-change-this")
 APP_NAME = os.getenv("APP_NAME", "Holiday Gifting Dashboard")
 DEBUG = os.getenv("DEBUG", "false").lower() == "true"
 
-# Status workflow
-GIFT_STATUSES = ["considering", "acquired", "wrapped", "given"]
+# Status workflow (GIFT_STATUSES is imported from app.utils.constants)
 STATUS_COLORS = {
     "considering": "🔵",  # Gray
     "acquired": "🟢",     # Blue
@@ -204,9 +228,7 @@ SESSION_KEYS = {
 }
 '''
 
-    with open("app/config.py", "w") as f:
-        f.write(config_content)
-    print("✓ Created app/config.py")
+    write_file("app/config.py", config_content)
 
 def create_utils():
     """Create utility files."""
@@ -218,7 +240,7 @@ Case File: Application Constants
 """
 
 # Status progression
-GIFT_STATUSES = ["considering", "acquired", "wrapped", "given"]
+GIFT_STATUSES = ("considering", "acquired", "wrapped", "given")
 
 STATUS_COLORS = {
     "considering": {"bg": "#F3F4F6", "fg": "#6B7280", "emoji": "🤔"},
@@ -227,6 +249,22 @@ STATUS_COLORS = {
     "given": {"bg": "#D1FAE5", "fg": "#059669", "emoji": "🎉"}
 }
 
+# Status badges (emoji + label), rendered once at import
+STATUS_BADGES = {
+    status: f"{colors['emoji']} {status.capitalize()}"
+    for status, colors in STATUS_COLORS.items()
+}
+
+# Workflow neighbours of each status (wrapping at both ends)
+NEXT_STATUS = {
+    status: GIFT_STATUSES[(i + 1) % len(GIFT_STATUSES)]
+    for i, status in enumerate(GIFT_STATUSES)
+}
+PREVIOUS_STATUS = {
+    status: GIFT_STATUSES[i - 1]
+    for i, status in enumerate(GIFT_STATUSES)
+}
+
 # Relationships (for dropdown)
 RELATIONSHIPS = [
     "Partner",
@@ -251,9 +289,7 @@ BUDGET_RANGES = [
 ]
 '''
 
-    with open("app/utils/constants.py", "w") as f:
-        f.write(constants_content)
-    print("✓ Created app/utils/constants.py")
+    write_file("app/utils/constants.py", constants_content)
 
     helpers_content = '''"""
 Helper functions for Holiday Gifting Dashboard.
@@ -261,43 +297,30 @@ Investigator: Clive
 Case File: Utility Functions
 """
 
+from collections import Counter
 from typing import List, Dict, Any
-import streamlit as st
-from app.utils.constants import STATUS_COLORS, GIFT_STATUSES
+from app.utils.constants import (
+    STATUS_COLORS, STATUS_BADGES, GIFT_STATUSES, NEXT_STATUS, PREVIOUS_STATUS
+)
 
 def get_next_status(current_status: str) -> str:
     """Advance to next status in workflow."""
-    try:
-        current_index = GIFT_STATUSES.index(current_status)
-        next_index = (current_index + 1) % len(GIFT_STATUSES)
-        return GIFT_STATUSES[next_index]
-    except ValueError:
-        return GIFT_STATUSES[0]
+    return NEXT_STATUS.get(current_status, GIFT_STATUSES[0])
 
 def get_previous_status(current_status: str) -> str:
     """Return to previous status in workflow."""
-    try:
-        current_index = GIFT_STATUSES.index(current_status)
-        prev_index = (current_index - 1) % len(GIFT_STATUSES)
-        return GIFT_STATUSES[prev_index]
-    except ValueError:
-        return GIFT_STATUSES[0]
+    return PREVIOUS_STATUS.get(current_status, GIFT_STATUSES[0])
 
 def calculate_progress(gifts: List[Dict[str, Any]]) -> Dict[str, Any]:
     """Calculate gift progress statistics."""
-    if not gifts:
-        return {
-            "total": 0,
-            "acquired": 0,
-            "wrapped": 0,
-            "given": 0,
-            "percentage": 0
-        }
-
-    total = len(gifts)
-    acquired = sum(1 for g in gifts if g.get("status") in ["acquired", "wrapped", "given"])
-    wrapped = sum(1 for g in gifts if g.get("status") in ["wrapped", "given"])
-    given = sum(1 for g in gifts if g.get("status") == "given")
+    return progress_from_counts(Counter(g.get("status") for g in gifts))
+
+def progress_from_counts(status_counts: Dict[str, int]) -> Dict[str, Any]:
+    """Calculate gift progress statistics from per-status gift counts."""
+    total = sum(status_counts.values())
+    given = status_counts.get("given", 0)
+    wrapped = status_counts.get("wrapped", 0) + given
+    acquired = status_counts.get("acquired", 0) + wrapped
 
     return {
         "total": total,
@@ -315,13 +338,13 @@ def format_currency(amount: float) -> str:
 
 def render_status_badge(status: str) -> str:
     """Render a status badge with appropriate styling."""
-    colors = STATUS_COLORS.get(status, STATUS_COLORS["considering"])
-    return f"{colors[\'emoji\']} {status.capitalize()}"
+    badge = STATUS_BADGES.get(status)
+    if badge is None:
+        badge = f"{STATUS_COLORS[\'considering\'][\'emoji\']} {status.capitalize()}"
+    return badge
 '''
 
-    with open("app/utils/helpers.py", "w") as f:
-        f.write(helpers_content)
-    print("✓ Created app/utils/helpers.py")
+    write_file("app/utils/helpers.py", helpers_content)
 
 def create_run_script():
     """Create a run.sh script for easy startup."""
@@ -347,9 +370,14 @@ fi
 echo "🔧 Activating virtual environment..."
 source venv/bin/activate
 
-# Install dependencies
-echo "📚 Installing dependencies..."
-pip install -r requirements.txt --quiet
+# Install dependencies, skipping pip when requirements.txt is unchanged since the last install
+req_hash=$( (sha256sum requirements.txt 2>/dev/null || shasum -a 256 requirements.txt) | awk \'{print $1}\')
+if [ "$req_hash" != "$(cat venv/.requirements.sha256 2>/dev/null)" ]; then
+    echo "📚 Installing dependencies..."
+    pip install -r requirements.txt --quiet && echo "$req_hash" > venv/.requirements.sha256
+else
+    echo "✓ Dependencies up to date"
+fi
 
 # Create .env if it doesn't exist
 if [ ! -f ".env" ]; then
@@ -365,15 +393,11 @@ mkdir -p data
 echo "🚀 Launching Holiday Gifting Dashboard..."
 echo "📍 Access at: http://localhost:8501"
 echo "Press Ctrl+C to stop"
-streamlit run app/main.py
+python -m streamlit run app/main.py
 '''
 
-    with open("run.sh", "w") as f:
-        f.write(run_content)
-
-    # Make it executable
-    os.chmod("run.sh", 0o755)
-    print("✓ Created run.sh (executable)")
+    # Executable so it can be started with ./run.sh
+    write_file("run.sh", run_content, mode=0o755)
 
 def main():
     """Execute the bootstrap sequence."""
@@ -12,6 +12,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from app.database import init_db, get_db, close_db
+from app.models import Giftee, GiftIdea
 from app.repository import UserRepository, GifteeRepository, GiftIdeaRepository
 
 
@@ -60,25 +61,25 @@ def main():
             }
         ]
 
-        sample_giftees = []
-        existing_giftees = GifteeRepository.get_user_giftees(db, demo_user.id)
-        existing_giftee_names = [g.name for g in existing_giftees]
+        existing_by_name = {
+            g.name: g for g in GifteeRepository.get_user_giftees(db, demo_user.id)
+        }
+        new_giftees = [
+            Giftee(user_id=demo_user.id, **giftee_data)
+            for giftee_data in giftees_data
+            if giftee_data["name"] not in existing_by_name
+        ]
+
+        # One batched INSERT for all new giftees; flush assigns their IDs
+        db.add_all(new_giftees)
+        db.flush()
 
         for giftee_data in giftees_data:
-            if giftee_data["name"] not in existing_giftee_names:
-                giftee = GifteeRepository.create_giftee(
-                    db,
-                    demo_user.id,
-                    **giftee_data
-                )
-                sample_giftees.append(giftee)
-                print(f"  ✓ Created giftee: {giftee.name}")
+            if giftee_data["name"] in existing_by_name:
+                print(f"  ✓ Giftee already exists: {giftee_data['name']}")
             else:
-                # Find and add existing giftee
-                for g in existing_giftees:
-                    if g.name == giftee_data["name"]:
-                        sample_giftees.append(g)
-                        print(f"  ✓ Giftee already exists: {g.name}")
+                print(f"  ✓ Created giftee: {giftee_data['name']}")
+        sample_giftees = list(existing_by_name.values()) + new_giftees
 
         # Create sample gifts
         print("\nStep 4: Creating sample gift ideas...")
@@ -112,22 +113,23 @@ def main():
             ]
         }
 
+        # Fetch every existing gift title once, not once per giftee
+        existing_titles = {
+            (g.giftee_id, g.title)
+            for g in GiftIdeaRepository.get_user_all_gifts(db, demo_user.id)
+        }
+        new_gifts = []
         for giftee in sample_giftees:
-            if giftee.name in gifts_by_giftee:
-                for gift_data in gifts_by_giftee[giftee.name]:
-                    # Check if gift already exists
-                    existing_gifts = GiftIdeaRepository.get_giftee_gifts(db, giftee.id)
-                    gift_exists = any(g.title == gift_data["title"] for g in existing_gifts)
-
-                    if not gift_exists:
-                        gift = GiftIdeaRepository.create_gift_idea(
-                            db,
-                            giftee.id,
-                            **gift_data
-                        )
-                        print(f"  ✓ Created gift for {giftee.name}: {gift.title}")
-                    else:
-                        print(f"  ✓ Gift already exists for {giftee.name}: {gift_data['title']}")
+            for gift_data in gifts_by_giftee.get(giftee.name, []):
+                if (giftee.id, gift_data["title"]) in existing_titles:
+                    print(f"  ✓ Gift already exists for {giftee.name}: {gift_data['title']}")
+                else:
+                    new_gifts.append(GiftIdea(giftee_id=giftee.id, **gift_data))
+                    print(f"  ✓ Created gift for {giftee.name}: {gift_data['title']}")
+
+        # One batched INSERT for all new gifts, and a single commit for the sample data
+        db.add_all(new_gifts)
+        db.commit()
 
     finally:
         close_db(db)
@@ -138,7 +140,7 @@ def main():
     print("\nYou can now log in with:")
     print("  Email: demo@example.com")
     print("  Password: demo123")
-    print("\nStart the app with: streamlit run app/main.py")
+    print("\nStart the app with: python -m streamlit run app/main.py")
     print("="*60 + "\n")
 
 
@@ -19,9 +19,14 @@ fi
 echo "🔧 Activating virtual environment..."
 source venv/bin/activate
 
-# Install dependencies
-echo "📚 Installing dependencies..."
-pip install -r requirements.txt --quiet
+# Install dependencies, skipping pip when requirements.txt is unchanged since the last install
+req_hash=$( (sha256sum requirements.txt 2>/dev/null || shasum -a 256 requirements.txt) | awk '{print $1}')
+if [ "$req_hash" != "$(cat venv/.requirements.sha256 2>/dev/null)" ]; then
+    echo "📚 Installing dependencies..."
+    pip install -r requirements.txt --quiet && echo "$req_hash" > venv/.requirements.sha256
+else
+    echo "✓ Dependencies up to date"
+fi
 
 # Create .env if it doesn't exist
 if [ ! -f ".env" ]; then
@@ -37,4 +42,4 @@ mkdir -p data
 echo "🚀 Launching Holiday Gifting Dashboard..."
 echo "📍 Access at: http://localhost:8501"
 echo "Press Ctrl+C to stop"
-streamlit run app/main.py
+python -m streamlit run app/main.py
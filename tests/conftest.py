@@ -22,20 +22,67 @@ Purpose: Educational test infrastructure for CS students
 """
 
 import pytest
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
 from app.models import Base, User, Giftee, GiftIdea
-import bcrypt
+from tests.fixtures.test_data import cached_password_hash, GifteeFactory, GiftIdeaFactory
+
+
+# Hashed ONCE when pytest loads this file, then shared by every sample_user.
+# bcrypt is slow on purpose; rounds=4 is the minimum and plenty for tests.
+SAMPLE_PASSWORD = "password123"
+SAMPLE_PASSWORD_HASH = cached_password_hash(SAMPLE_PASSWORD)
 
 
 # =============================================================================
 # CORE FIXTURES - Database Setup
 # =============================================================================
 
+@pytest.fixture(scope="session")
+def db_engine():
+    """
+    Creates ONE in-memory database (with all tables) for the whole test run.
+
+    LEARNING OBJECTIVE: Fixture Scopes
+    ===================================
+    scope="session" means pytest calls this fixture once and hands the same
+    engine to every test. Building the schema (CREATE TABLE, CREATE INDEX...)
+    is the slow part of database setup, so we only want to pay for it once.
+
+    But doesn't sharing a database break test isolation? Not if every test
+    undoes its own changes - see db_session below.
+
+    SQLite note:
+    ------------
+    StaticPool keeps the single :memory: connection alive (a new connection
+    would mean a new, empty database). The two event hooks let SQLAlchemy
+    control BEGIN itself, which Python's sqlite3 driver otherwise gets in
+    the way of - without them SAVEPOINTs don't work.
+    """
+    engine = create_engine(
+        "sqlite:///:memory:",  # :memory: = not saved to disk
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+
+    @event.listens_for(engine, "connect")
+    def _disable_driver_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+    Base.metadata.create_all(engine)  # Create all tables (User, Giftee, GiftIdea)
+    yield engine
+    engine.dispose()
+
+
 @pytest.fixture(scope="function")
-def db_session():
+def db_session(db_engine):
     """
-    Creates a fresh in-memory database for EACH test function.
+    Gives EACH test function a session whose changes are thrown away afterwards.
 
     LEARNING OBJECTIVE: Test Isolation
     ===================================
@@ -45,17 +92,21 @@ def db_session():
 
     Why "scope='function'"?
     -----------------------
-    This means a NEW database is created for every single test function.
-    Pros: Perfect isolation, tests can't affect each other
-    Cons: Slightly slower (but still fast - we're using in-memory SQLite)
+    This means a NEW session (and transaction) is created for every single
+    test function. The tables themselves come from the session-scoped
+    db_engine fixture, so we don't rebuild the schema each time.
 
     How it works:
     -------------
-    1. Create in-memory SQLite database (sqlite:///:memory:)
-    2. Create all tables (Base.metadata.create_all)
-    3. Create a session for the test to use
-    4. YIELD the session to the test (test runs here)
-    5. Clean up: close session and drop all tables
+    1. Open a connection and BEGIN an outer transaction
+    2. Create a session bound to that connection
+    3. YIELD the session to the test (test runs here)
+    4. Clean up: close the session and ROLL BACK the outer transaction
+
+    The trick is join_transaction_mode="create_savepoint": when the code
+    under test calls db.commit(), the session only commits a SAVEPOINT
+    inside our outer transaction. Rolling back the outer transaction at the
+    end erases everything the test did - commits included.
 
     The "yield" keyword is the magic:
     - Everything BEFORE yield = SETUP (runs before test)
@@ -68,20 +119,52 @@ def db_session():
         user = UserRepository.create_user(db_session, "test@example.com", ...)
         assert user.id is not None
     """
-    # Setup: Create a fresh in-memory database
-    engine = create_engine("sqlite:///:memory:")  # :memory: = not saved to disk
-    Base.metadata.create_all(engine)  # Create all tables (User, Giftee, GiftIdea)
-
-    # Create a session factory
-    SessionLocal = sessionmaker(bind=engine)
-    session = SessionLocal()
+    # Setup: Start a transaction that the test can never really commit
+    connection = db_engine.connect()
+    transaction = connection.begin()
+    session = Session(
+        bind=connection,
+        join_transaction_mode="create_savepoint",
+        autoflush=False,  # Same as the app's session factory - flush explicitly
+        expire_on_commit=False  # Objects stay loaded after commit - no re-SELECT
+    )
 
     # Provide the session to the test
     yield session
 
-    # Teardown: Clean up after the test finishes
+    # Teardown: Undo everything the test did
     session.close()
-    Base.metadata.drop_all(engine)
+    transaction.rollback()
+    connection.close()
+
+
+@pytest.fixture
+def sql_capture(db_engine):
+    """
+    Records every SQL statement sent to the database during a test.
+
+    LEARNING OBJECTIVE: Testing HOW Code Talks to the Database
+    ============================================================
+    Most tests check WHAT a function returns. Sometimes HOW it gets there
+    matters too - e.g. "totals are computed with one SUM query, not by
+    loading every row into Python". SQLAlchemy fires a
+    "before_cursor_execute" event for each statement; we append the SQL
+    text to a list the test can inspect.
+
+    Example usage:
+    --------------
+    def test_total_is_one_query(db_session, sample_giftee, sql_capture):
+        GiftIdeaRepository.get_giftee_total_cost(db_session, sample_giftee.id)
+        assert len(sql_capture) == 1
+    """
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db_engine, "before_cursor_execute", _record)
+    yield statements
+    event.remove(db_engine, "before_cursor_execute", _record)
 
 
 # =============================================================================
@@ -127,18 +210,15 @@ def sample_user(db_session):
     - name: Test User
     - password: hashed version of "password123"
     """
-    # Create user with bcrypt hashed password
-    password_hash = bcrypt.hashpw("password123".encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
-
+    # Reuse the pre-computed hash - hashing per test would dominate suite time
     user = User(
         email="test@example.com",
         name="Test User",
-        password_hash=password_hash
+        password_hash=SAMPLE_PASSWORD_HASH
     )
 
     db_session.add(user)
-    db_session.commit()
-    db_session.refresh(user)  # Refresh to get the auto-generated ID
+    db_session.flush()  # INSERT now; the auto-generated ID is filled in for us
 
     return user
 
@@ -181,8 +261,7 @@ def sample_giftee(db_session, sample_user):
     )
 
     db_session.add(giftee)
-    db_session.commit()
-    db_session.refresh(giftee)
+    db_session.flush()
 
     return giftee
 
@@ -225,8 +304,7 @@ def sample_gift_idea(db_session, sample_giftee):
     )
 
     db_session.add(gift)
-    db_session.commit()
-    db_session.refresh(gift)
+    db_session.flush()
 
     return gift
 
@@ -268,36 +346,16 @@ def user_with_multiple_giftees(db_session, sample_user):
         total = GifteeRepository.get_total_budget(db_session, user.id)
         assert total == 250.0  # 100 + 75 + 75
     """
-    giftee1 = Giftee(
-        name="Alice",
-        relationship="Sister",
-        budget=100.0,
-        user_id=sample_user.id
-    )
-    giftee2 = Giftee(
-        name="Bob",
-        relationship="Brother",
-        budget=75.0,
-        user_id=sample_user.id
-    )
-    giftee3 = Giftee(
-        name="Carol",
-        relationship="Friend",
-        budget=75.0,
-        user_id=sample_user.id
-    )
-
-    db_session.add_all([giftee1, giftee2, giftee3])
-    db_session.commit()
-
-    # Refresh to get IDs
-    db_session.refresh(giftee1)
-    db_session.refresh(giftee2)
-    db_session.refresh(giftee3)
+    # One multi-row INSERT for all three; RETURNING fills in their IDs
+    giftees = GifteeFactory.bulk_create(db_session, sample_user.id, [
+        {"name": "Alice", "relationship": "Sister", "budget": 100.0},
+        {"name": "Bob", "relationship": "Brother", "budget": 75.0},
+        {"name": "Carol", "relationship": "Friend", "budget": 75.0}
+    ])
 
     return {
         'user': sample_user,
-        'giftees': [giftee1, giftee2, giftee3]
+        'giftees': giftees
     }
 
 
@@ -339,49 +397,17 @@ def giftee_with_multiple_gifts(db_session, sample_giftee):
         total = GiftIdeaRepository.get_giftee_total_cost(db_session, giftee.id)
         assert total == 130.0  # 40 + 30 + 60 (excludes the $50 considering gift)
     """
-    gift_considering = GiftIdea(
-        title="Considering Gift",
-        price=50.0,
-        rank=1,
-        status="considering",
-        giftee_id=sample_giftee.id
-    )
-
-    gift_acquired = GiftIdea(
-        title="Acquired Gift",
-        price=40.0,
-        rank=2,
-        status="acquired",
-        giftee_id=sample_giftee.id
-    )
-
-    gift_wrapped = GiftIdea(
-        title="Wrapped Gift",
-        price=30.0,
-        rank=3,
-        status="wrapped",
-        giftee_id=sample_giftee.id
-    )
-
-    gift_given = GiftIdea(
-        title="Given Gift",
-        price=60.0,
-        rank=4,
-        status="given",
-        giftee_id=sample_giftee.id
-    )
-
-    db_session.add_all([gift_considering, gift_acquired, gift_wrapped, gift_given])
-    db_session.commit()
+    # One multi-row INSERT for all four gifts
+    gifts = GiftIdeaFactory.bulk_create(db_session, sample_giftee.id, [
+        {"title": "Considering Gift", "price": 50.0, "rank": 1, "status": "considering"},
+        {"title": "Acquired Gift", "price": 40.0, "rank": 2, "status": "acquired"},
+        {"title": "Wrapped Gift", "price": 30.0, "rank": 3, "status": "wrapped"},
+        {"title": "Given Gift", "price": 60.0, "rank": 4, "status": "given"}
+    ])
 
     return {
         'giftee': sample_giftee,
-        'gifts': {
-            'considering': gift_considering,
-            'acquired': gift_acquired,
-            'wrapped': gift_wrapped,
-            'given': gift_given
-        }
+        'gifts': {gift.status: gift for gift in gifts}
     }
 
 
@@ -432,17 +458,14 @@ def create_test_user(db_session, email="test@example.com", name="Test User", pas
     --------
     User object saved to database
     """
-    password_hash = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
-
     user = User(
         email=email,
         name=name,
-        password_hash=password_hash
+        password_hash=cached_password_hash(password)
     )
 
     db_session.add(user)
-    db_session.commit()
-    db_session.refresh(user)
+    db_session.flush()  # INSERT now and fill in user.id; no COMMIT or re-SELECT needed
 
     return user
 
@@ -474,8 +497,7 @@ def create_test_giftee(db_session, user_id, name="Test Giftee", relationship=Non
     )
 
     db_session.add(giftee)
-    db_session.commit()
-    db_session.refresh(giftee)
+    db_session.flush()  # INSERT now and fill in giftee.id; no COMMIT or re-SELECT needed
 
     return giftee
 
@@ -526,8 +548,7 @@ def create_test_gift_idea(db_session, giftee_id, title="Test Gift", **kwargs):
     )
 
     db_session.add(gift)
-    db_session.commit()
-    db_session.refresh(gift)
+    db_session.flush()  # INSERT now and fill in gift.id; no COMMIT or re-SELECT needed
 
     return gift
 
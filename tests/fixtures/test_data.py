@@ -35,9 +35,51 @@ Purpose: Educational test data creation
 """
 
 import bcrypt
+from functools import lru_cache
+from sqlalchemy import insert
+from sqlalchemy.orm import lazyload
 from app.models import User, Giftee, GiftIdea
 from typing import Optional
-import random
+import itertools
+
+
+# One salt for every fixture password. Real users need unique salts so that
+# equal passwords hash differently; test data has no attacker to worry about.
+_FIXTURE_SALT = bcrypt.gensalt(rounds=4)
+
+
+@lru_cache(maxsize=128)
+def cached_password_hash(password: str) -> str:
+    """
+    Hash a test password once and reuse the result.
+
+    bcrypt is slow on purpose (~200ms at the default cost of 12). Test users
+    don't need that protection, so we use rounds=4 (the minimum) and cache
+    per password: the 100th user with "password123" costs a dict lookup.
+    """
+    return bcrypt.hashpw(password.encode('utf-8'), _FIXTURE_SALT).decode('utf-8')
+
+
+def _bulk_insert(db_session, model, rows: list[dict]) -> list:
+    """
+    INSERT all rows in one statement and return them as ORM objects.
+
+    SQLAlchemy 2.x sends the whole list as a multi-row INSERT ... RETURNING,
+    so N objects cost one round trip instead of N. Nothing is committed:
+    the test's transaction owns the rows and rolls them back at teardown.
+
+    Why not returning(..., sort_by_parameter_order=True)? SQLite can't
+    promise RETURNING order, so SQLAlchemy would quietly fall back to one
+    INSERT per row. SQLite does hand out autoincrement ids in VALUES order,
+    so sorting by id restores the order the rows were passed in.
+    lazyload("*") stops selectin relationships (Giftee.gifts) from firing
+    an extra SELECT for rows that can't have children yet.
+    """
+    objects = db_session.scalars(
+        insert(model).returning(model).options(lazyload("*")),
+        rows
+    ).all()
+    return sorted(objects, key=lambda obj: obj.id)
 
 
 # =============================================================================
@@ -59,7 +101,7 @@ class UserFactory:
     - One place to update if User model changes
     """
 
-    _counter = 0  # Class variable for unique emails
+    _counter = itertools.count(1)  # Class variable for unique emails
 
     @classmethod
     def create(
@@ -99,28 +141,26 @@ class UserFactory:
             password="secure456"
         )
         """
+        return _bulk_insert(db_session, User, [cls._row(email, name, password)])[0]
+
+    @classmethod
+    def _row(
+        cls,
+        email: Optional[str] = None,
+        name: str = "Test User",
+        password: str = "password123"
+    ) -> dict:
+        """Build the column values for one user without touching the database."""
         # Auto-generate unique email if not provided
         if email is None:
-            cls._counter += 1
-            email = f"testuser{cls._counter}@example.com"
-
-        # Hash the password (bcrypt is slow, so we only do it when needed)
-        password_hash = bcrypt.hashpw(
-            password.encode('utf-8'),
-            bcrypt.gensalt()
-        ).decode('utf-8')
-
-        user = User(
-            email=email,
-            name=name,
-            password_hash=password_hash
-        )
+            email = f"testuser{next(cls._counter)}@example.com"
 
-        db_session.add(user)
-        db_session.commit()
-        db_session.refresh(user)  # Get the auto-generated ID
-
-        return user
+        return {
+            "email": email,
+            "name": name,
+            # bcrypt is slow, so each distinct password is only hashed once
+            "password_hash": cached_password_hash(password)
+        }
 
     @classmethod
     def create_batch(cls, db_session, count: int = 3, **kwargs) -> list[User]:
@@ -150,12 +190,9 @@ class UserFactory:
         # Create 3 users with same name:
         users = UserFactory.create_batch(db_session, count=3, name="Test User")
         """
-        users = []
-        for i in range(count):
-            # Each user gets unique email, but can share other attributes
-            user = cls.create(db_session, **kwargs)
-            users.append(user)
-        return users
+        # Each user gets unique email, but can share other attributes
+        rows = [cls._row(**kwargs) for _ in range(count)]
+        return _bulk_insert(db_session, User, rows)
 
 
 class GifteeFactory:
@@ -168,7 +205,7 @@ class GifteeFactory:
     This factory handles that requirement elegantly.
     """
 
-    _counter = 0
+    _counter = itertools.count(1)
 
     # Realistic sample names for variety in tests
     _sample_names = [
@@ -182,6 +219,11 @@ class GifteeFactory:
         "Partner", "Colleague", "Cousin", "Aunt", "Uncle"
     ]
 
+    # Hand out names and relationships in order: deterministic, and unique
+    # until the list wraps around
+    _name_cycle = itertools.cycle(_sample_names)
+    _relationship_cycle = itertools.cycle(_sample_relationships)
+
     @classmethod
     def create(
         cls,
@@ -199,8 +241,8 @@ class GifteeFactory:
         -----------
         db_session: SQLAlchemy session
         user_id: ID of user who owns this giftee (REQUIRED)
-        name: Giftee name (random if None)
-        relationship: Relationship to user (random if None)
+        name: Giftee name (next sample name if None)
+        relationship: Relationship to user (next sample relationship if None)
         budget: Budget amount (None if not specified)
         notes: Optional notes
 
@@ -221,31 +263,38 @@ class GifteeFactory:
             budget=150.0
         )
         """
+        row = cls._row(user_id, name, relationship, budget, notes)
+        return _bulk_insert(db_session, Giftee, [row])[0]
+
+    @classmethod
+    def _row(
+        cls,
+        user_id: int,
+        name: Optional[str] = None,
+        relationship: Optional[str] = None,
+        budget: Optional[float] = None,
+        notes: Optional[str] = None
+    ) -> dict:
+        """Build the column values for one giftee without touching the database."""
         # Auto-generate realistic name if not provided
         if name is None:
-            cls._counter += 1
-            name = random.choice(cls._sample_names)
+            n = next(cls._counter)
+            name = next(cls._name_cycle)
             # Make it unique if we've run out of names
-            if cls._counter > len(cls._sample_names):
-                name = f"{name} {cls._counter}"
+            if n > len(cls._sample_names):
+                name = f"{name} {n}"
 
         # Auto-generate realistic relationship if not provided
         if relationship is None:
-            relationship = random.choice(cls._sample_relationships)
-
-        giftee = Giftee(
-            name=name,
-            relationship=relationship,
-            budget=budget,
-            notes=notes,
-            user_id=user_id
-        )
-
-        db_session.add(giftee)
-        db_session.commit()
-        db_session.refresh(giftee)
-
-        return giftee
+            relationship = next(cls._relationship_cycle)
+
+        return {
+            "name": name,
+            "relationship": relationship,
+            "budget": budget,
+            "notes": notes,
+            "user_id": user_id
+        }
 
     @classmethod
     def create_batch(
@@ -271,11 +320,35 @@ class GifteeFactory:
             budget=100.0
         )
         """
-        giftees = []
-        for i in range(count):
-            giftee = cls.create(db_session, user_id=user_id, **kwargs)
-            giftees.append(giftee)
-        return giftees
+        rows = [cls._row(user_id, **kwargs) for _ in range(count)]
+        return _bulk_insert(db_session, Giftee, rows)
+
+    @classmethod
+    def bulk_create(
+        cls,
+        db_session,
+        user_id: int,
+        giftees: list[dict]
+    ) -> list[Giftee]:
+        """
+        Create several specific giftees for a user in one INSERT.
+
+        Each dict holds the fields you care about; anything left out gets
+        the same defaults as create(). Giftees come back in the order given.
+
+        Example usage:
+        --------------
+        mom, dad = GifteeFactory.bulk_create(
+            db_session,
+            user_id=user.id,
+            giftees=[
+                {"name": "Mom", "budget": 100.0},
+                {"name": "Dad", "budget": 75.0}
+            ]
+        )
+        """
+        rows = [cls._row(user_id, **giftee) for giftee in giftees]
+        return _bulk_insert(db_session, Giftee, rows)
 
 
 class GiftIdeaFactory:
@@ -289,7 +362,7 @@ class GiftIdeaFactory:
     common test scenarios.
     """
 
-    _counter = 0
+    _counter = itertools.count(1)
 
     # Realistic sample gift titles
     _sample_titles = [
@@ -298,6 +371,10 @@ class GiftIdeaFactory:
         "Photo Frame", "Cookbook", "Art Print", "Blanket", "Journal"
     ]
 
+    _title_cycle = itertools.cycle(_sample_titles)
+    # Every whole-dollar price from $20 to $99, in a scrambled but fixed order
+    _price_cycle = itertools.cycle([float((i * 37) % 80 + 20) for i in range(1, 81)])
+
     @classmethod
     def create(
         cls,
@@ -317,10 +394,10 @@ class GiftIdeaFactory:
         -----------
         db_session: SQLAlchemy session
         giftee_id: ID of giftee this gift is for (REQUIRED)
-        title: Gift title (random if None)
+        title: Gift title (next sample title if None)
         description: Gift description (None by default)
         url: Product URL (None by default)
-        price: Price in dollars (random $20-100 if None)
+        price: Price in dollars (next sample price, $20-99, if None)
         rank: Priority ranking (default: 1 = top priority)
         status: Workflow status (default: "considering")
 
@@ -343,33 +420,42 @@ class GiftIdeaFactory:
             status="acquired"
         )
         """
+        row = cls._row(giftee_id, title, description, url, price, rank, status)
+        return _bulk_insert(db_session, GiftIdea, [row])[0]
+
+    @classmethod
+    def _row(
+        cls,
+        giftee_id: int,
+        title: Optional[str] = None,
+        description: Optional[str] = None,
+        url: Optional[str] = None,
+        price: Optional[float] = None,
+        rank: int = 1,
+        status: str = "considering"
+    ) -> dict:
+        """Build the column values for one gift idea without touching the database."""
         # Auto-generate title if not provided
         if title is None:
-            cls._counter += 1
-            title = random.choice(cls._sample_titles)
+            n = next(cls._counter)
+            title = next(cls._title_cycle)
             # Make unique if needed
-            if cls._counter > len(cls._sample_titles):
-                title = f"{title} #{cls._counter}"
+            if n > len(cls._sample_titles):
+                title = f"{title} #{n}"
 
         # Auto-generate realistic price if not provided
         if price is None:
-            price = round(random.uniform(20.0, 100.0), 2)
-
-        gift = GiftIdea(
-            title=title,
-            description=description,
-            url=url,
-            price=price,
-            rank=rank,
-            status=status,
-            giftee_id=giftee_id
-        )
-
-        db_session.add(gift)
-        db_session.commit()
-        db_session.refresh(gift)
-
-        return gift
+            price = next(cls._price_cycle)
+
+        return {
+            "title": title,
+            "description": description,
+            "url": url,
+            "price": price,
+            "rank": rank,
+            "status": status,
+            "giftee_id": giftee_id
+        }
 
     @classmethod
     def create_batch(
@@ -384,7 +470,7 @@ class GiftIdeaFactory:
 
         Example usage:
         --------------
-        # Create 5 random gifts:
+        # Create 5 gifts with default data:
         gifts = GiftIdeaFactory.create_batch(db_session, giftee_id=giftee.id, count=5)
 
         # Create 3 acquired gifts:
@@ -395,18 +481,40 @@ class GiftIdeaFactory:
             status="acquired"
         )
         """
-        gifts = []
-        for i in range(count):
-            # Auto-increment rank for each gift
-            rank = kwargs.get('rank', i + 1)
-            gift = cls.create(
-                db_session,
-                giftee_id=giftee_id,
-                rank=rank,
-                **{k: v for k, v in kwargs.items() if k != 'rank'}
-            )
-            gifts.append(gift)
-        return gifts
+        # Auto-increment rank for each gift unless one was given
+        rank = kwargs.pop('rank', None)
+        rows = [
+            cls._row(giftee_id, rank=i + 1 if rank is None else rank, **kwargs)
+            for i in range(count)
+        ]
+        return _bulk_insert(db_session, GiftIdea, rows)
+
+    @classmethod
+    def bulk_create(
+        cls,
+        db_session,
+        giftee_id: int,
+        gifts: list[dict]
+    ) -> list[GiftIdea]:
+        """
+        Create several specific gift ideas for a giftee in one INSERT.
+
+        Each dict holds the fields you care about; anything left out gets
+        the same defaults as create(). Gifts come back in the order given.
+
+        Example usage:
+        --------------
+        first, second = GiftIdeaFactory.bulk_create(
+            db_session,
+            giftee_id=giftee.id,
+            gifts=[
+                {"title": "First", "rank": 1},
+                {"title": "Second", "rank": 2, "status": "acquired"}
+            ]
+        )
+        """
+        rows = [cls._row(giftee_id, **gift) for gift in gifts]
+        return _bulk_insert(db_session, GiftIdea, rows)
 
     @classmethod
     def create_workflow_set(
@@ -447,20 +555,20 @@ class GiftIdeaFactory:
         # Should NOT include 'considering' gift price
         """
         statuses = ['considering', 'acquired', 'wrapped', 'given']
-        gifts = {}
-
-        for i, status in enumerate(statuses):
-            gift = cls.create(
-                db_session,
-                giftee_id=giftee_id,
+        rows = [
+            cls._row(
+                giftee_id,
                 title=f"{status.title()} Gift",
                 price=25.0 * (i + 1),  # $25, $50, $75, $100
                 rank=i + 1,
                 status=status
             )
-            gifts[status] = gift
+            for i, status in enumerate(statuses)
+        ]
 
-        return gifts
+        # All four gifts go in with a single INSERT
+        gifts = _bulk_insert(db_session, GiftIdea, rows)
+        return {gift.status: gift for gift in gifts}
 
 
 # =============================================================================
@@ -598,7 +706,7 @@ BENEFITS OF FACTORIES:
 ✅ Easy to create variations
 ✅ Tests focus on what they're testing (not setup)
 ✅ One place to maintain test data creation
-✅ Realistic, randomized data for robustness
+✅ Realistic, varied data that is the same on every run
 
 WHEN NOT TO USE FACTORIES:
 ==========================
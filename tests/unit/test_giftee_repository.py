@@ -27,8 +27,9 @@ Purpose: Educational testing example for CS students
 """
 
 import pytest
+from sqlalchemy import func, inspect, select, text
 from app.repository import GifteeRepository, UserRepository
-from app.models import Giftee
+from app.models import Giftee, GiftIdea
 from tests.fixtures.test_data import UserFactory, GifteeFactory
 
 
@@ -214,6 +215,27 @@ class TestGifteeRetrieval:
         # Assert
         assert found is None, "Should return None for non-existent ID"
 
+    def test_get_giftee_by_id_uses_identity_map(self, db_session, sample_giftee, sql_capture):
+        """
+        Test that looking up a giftee already in the session sends no SQL.
+
+        LEARNING: Session.get() and the Identity Map
+        =============================================
+        The session remembers every row it has loaded, keyed by primary key.
+        Session.get() checks that map first and only queries on a miss;
+        query(...).filter(...).first() always goes to the database.
+        """
+        # Arrange - sample_giftee is already in the session
+        sql_capture.clear()
+
+        # Act
+        first = GifteeRepository.get_giftee_by_id(db_session, sample_giftee.id)
+        second = GifteeRepository.get_giftee_by_id(db_session, sample_giftee.id)
+
+        # Assert
+        assert first is second is sample_giftee
+        assert sql_capture == [], "Identity-map hits should not query the database"
+
     def test_get_user_giftees_returns_all_for_user(self, db_session, user_with_multiple_giftees):
         """
         Test retrieving all giftees for a specific user.
@@ -269,6 +291,50 @@ class TestGifteeRetrieval:
         assert giftees == [], "Should return empty list, not None"
         assert isinstance(giftees, list), "Should be a list type"
 
+    def test_get_user_giftees_with_gifts_loads_gifts_in_rank_order(self, db_session, giftee_with_multiple_gifts):
+        """
+        Test that giftees come back with their gifts already loaded.
+
+        LEARNING: The N+1 Query Problem
+        ================================
+        Looping over giftees and querying each one's gifts costs 1 query
+        for the giftees plus N queries for the gifts. Eager loading
+        (selectinload) fetches all the gifts in ONE extra query instead.
+        """
+        # Arrange
+        giftee = giftee_with_multiple_gifts['giftee']
+        db_session.expire_all()  # Forget cached objects so loading is real
+
+        # Act
+        giftees = GifteeRepository.get_user_giftees_with_gifts(db_session, giftee.user_id)
+
+        # Assert
+        assert [g.id for g in giftees] == [giftee.id]
+        assert 'gifts' in giftees[0].__dict__, "Gifts should be loaded, not lazy"
+        assert [gift.rank for gift in giftees[0].gifts] == [1, 2, 3, 4]
+
+    def test_get_user_giftees_loads_gifts_by_default(self, db_session, giftee_with_multiple_gifts):
+        """
+        Test that plain giftee queries also load gifts eagerly.
+
+        LEARNING: Loader Strategies
+        ============================
+        Giftee.gifts is declared with lazy="selectin", so ANY query that
+        returns giftees batches their gifts into a single "WHERE giftee_id
+        IN (...)" query. Code that forgets to ask for eager loading can't
+        accidentally fall back to one query per giftee.
+        """
+        # Arrange
+        giftee = giftee_with_multiple_gifts['giftee']
+        db_session.expire_all()
+
+        # Act
+        giftees = GifteeRepository.get_user_giftees(db_session, giftee.user_id)
+
+        # Assert
+        assert 'gifts' in giftees[0].__dict__, "Gifts should be loaded with the giftee"
+        assert len(giftees[0].gifts) == 4
+
     def test_user_isolation_cannot_see_other_users_giftees(self, db_session):
         """
         Test that users can only see their own giftees.
@@ -281,12 +347,11 @@ class TestGifteeRetrieval:
         Imagine if you could see everyone else's Christmas gift lists.
         That would ruin the surprise (and violate privacy!).
         """
-        # Arrange - Create two users with giftees
-        user1 = UserFactory.create(db_session, email="user1@test.com")
-        user2 = UserFactory.create(db_session, email="user2@test.com")
+        # Arrange - Create two users (one INSERT) with a giftee each
+        user1, user2 = UserFactory.create_batch(db_session, count=2)
 
-        giftee1 = GifteeRepository.create_giftee(db_session, user1.id, "User1's Mom")
-        giftee2 = GifteeRepository.create_giftee(db_session, user2.id, "User2's Dad")
+        giftee1 = GifteeFactory.create(db_session, user1.id, "User1's Mom")
+        giftee2 = GifteeFactory.create(db_session, user2.id, "User2's Dad")
 
         # Act - Get user1's giftees
         user1_giftees = GifteeRepository.get_user_giftees(db_session, user1.id)
@@ -388,6 +453,27 @@ class TestGifteeUpdates:
         assert updated.budget == updates['budget']
         assert updated.notes == updates['notes']
 
+    def test_update_giftee_is_a_single_update_returning(self, db_session, sample_giftee, sql_capture):
+        """
+        Test that an update writes and reads the row in one statement.
+
+        LEARNING: UPDATE ... RETURNING
+        ===============================
+        Loading a row, changing it and loading it again costs several round
+        trips. RETURNING makes the UPDATE hand back the changed row itself.
+        """
+        # Arrange
+        sql_capture.clear()
+
+        # Act
+        updated = GifteeRepository.update_giftee(db_session, sample_giftee.id, budget=120.0)
+
+        # Assert
+        statements = [s for s in sql_capture if not s.lstrip().upper().startswith(("SAVEPOINT", "RELEASE"))]
+        assert len(statements) == 1
+        assert "RETURNING" in statements[0].upper()
+        assert updated.budget == 120.0
+
     def test_update_nonexistent_giftee_returns_none(self, db_session):
         """
         Test updating a giftee that doesn't exist.
@@ -420,8 +506,10 @@ class TestGifteeUpdates:
         ================================
         Look at the update_giftee implementation:
         ```python
-        if hasattr(giftee, key) and value is not None:
-            setattr(giftee, key, value)
+        values = {
+            key: value for key, value in kwargs.items()
+            if key in Giftee.__table__.columns and value is not None
+        }
         ```
 
         It only updates if value is not None. This means you can't use
@@ -527,20 +615,19 @@ class TestGifteeDeletion:
         """
         # Arrange
         giftee = giftee_with_multiple_gifts['giftee']
-        gifts = giftee_with_multiple_gifts['gifts']
         giftee_id = giftee.id
 
-        # Verify gifts exist before deletion
-        from app.repository import GiftIdeaRepository
-        before_delete = GiftIdeaRepository.get_giftee_gifts(db_session, giftee_id)
-        assert len(before_delete) == 4, "Giftee should have 4 gifts before deletion"
+        # Verify gifts exist before deletion (a COUNT - no need to load them)
+        count_gifts = select(func.count()).select_from(GiftIdea).where(GiftIdea.giftee_id == giftee_id)
+        before_delete = db_session.scalar(count_gifts)
+        assert before_delete == 4, "Giftee should have 4 gifts before deletion"
 
         # Act
         GifteeRepository.delete_giftee(db_session, giftee_id)
 
         # Assert - Gifts should also be deleted
-        after_delete = GiftIdeaRepository.get_giftee_gifts(db_session, giftee_id)
-        assert len(after_delete) == 0, \
+        after_delete = db_session.scalar(count_gifts)
+        assert after_delete == 0, \
             "All gifts should be deleted when giftee is deleted (CASCADE)"
 
 
@@ -565,12 +652,9 @@ class TestBudgetCalculations:
     def test_get_total_budget_single_giftee(self, db_session, sample_user):
         """Test total budget with one giftee."""
         # Arrange
-        GifteeRepository.create_giftee(
-            db_session,
-            sample_user.id,
-            "Test Giftee",
-            budget=100.0
-        )
+        GifteeFactory.bulk_create(db_session, sample_user.id, [
+            {"name": "Test Giftee", "budget": 100.0}
+        ])
 
         # Act
         total = GifteeRepository.get_total_budget(db_session, sample_user.id)
@@ -616,16 +700,12 @@ class TestBudgetCalculations:
 
         This test ensures None values are handled gracefully.
         """
-        # Arrange - Create giftees with and without budgets
-        GifteeRepository.create_giftee(
-            db_session, sample_user.id, "With Budget", budget=100.0
-        )
-        GifteeRepository.create_giftee(
-            db_session, sample_user.id, "No Budget", budget=None
-        )
-        GifteeRepository.create_giftee(
-            db_session, sample_user.id, "Also Budget", budget=50.0
-        )
+        # Arrange - Create giftees with and without budgets (one INSERT)
+        GifteeFactory.bulk_create(db_session, sample_user.id, [
+            {"name": "With Budget", "budget": 100.0},
+            {"name": "No Budget", "budget": None},
+            {"name": "Also Budget", "budget": 50.0}
+        ])
 
         # Act
         total = GifteeRepository.get_total_budget(db_session, sample_user.id)
@@ -646,8 +726,10 @@ class TestBudgetCalculations:
     def test_get_total_budget_zero_when_all_budgets_none(self, db_session, sample_user):
         """Test total budget when all giftees have None budget."""
         # Arrange
-        GifteeRepository.create_giftee(db_session, sample_user.id, "No Budget 1", budget=None)
-        GifteeRepository.create_giftee(db_session, sample_user.id, "No Budget 2", budget=None)
+        GifteeFactory.bulk_create(db_session, sample_user.id, [
+            {"name": "No Budget 1", "budget": None},
+            {"name": "No Budget 2", "budget": None}
+        ])
 
         # Act
         total = GifteeRepository.get_total_budget(db_session, sample_user.id)
@@ -655,6 +737,76 @@ class TestBudgetCalculations:
         # Assert
         assert total == 0.0, "Should return 0 when all budgets are None"
 
+    def test_get_total_budget_is_a_single_sum_query(self, db_session, user_with_multiple_giftees, sql_capture):
+        """
+        Test that the total budget is added up by the database, in one query.
+
+        LEARNING: Aggregates Belong in SQL
+        ===================================
+        Loading every giftee and summing budgets in Python would return the
+        same number - while moving every row over the wire. Counting the
+        SQL statements catches that: one SELECT SUM(...) for any number of
+        giftees.
+        """
+        # Arrange
+        user = user_with_multiple_giftees['user']
+        sql_capture.clear()  # Ignore the fixture's own INSERTs
+
+        # Act
+        total = GifteeRepository.get_total_budget(db_session, user.id)
+
+        # Assert
+        assert total == 250.0
+        assert len(sql_capture) == 1, "Should run exactly one query"
+        assert "sum(" in sql_capture[0].lower(), "Should sum in SQL, not in Python"
+
+
+# =============================================================================
+# TEST CLASS: Indexes
+# =============================================================================
+
+class TestGifteeIndexes:
+    """
+    Tests that the queries behind the dashboard stay index-backed.
+
+    LEARNING OBJECTIVE: Testing the Schema, Not Just the Data
+    ==========================================================
+    Without an index, "WHERE user_id = ?" reads EVERY giftee of EVERY user
+    to find one user's list. The results are identical - only slower as the
+    table grows - so no value-based test would ever notice the index
+    going missing. We check the schema directly instead.
+    """
+
+    def test_user_id_is_indexed(self, db_session):
+        """Test that giftees.user_id leads at least one index."""
+        # Act
+        indexes = inspect(db_session.connection()).get_indexes("giftees")
+
+        # Assert
+        assert any(index["column_names"][0] == "user_id" for index in indexes), \
+            "get_user_giftees filters on user_id and needs an index for it"
+
+    def test_user_giftees_in_id_order_need_no_sort(self, db_session):
+        """
+        Test that one user's giftees come back in id order straight from the index.
+
+        LEARNING: EXPLAIN QUERY PLAN
+        =============================
+        SQLite appends the rowid (our integer id) to every index entry, so
+        ix_giftees_user_id already behaves like an index on (user_id, id).
+        The plan should SEARCH that index and never build a temporary
+        B-tree to sort - a separate (user_id, id) index would add nothing.
+        """
+        # Act
+        plan = db_session.execute(text(
+            "EXPLAIN QUERY PLAN SELECT * FROM giftees WHERE user_id = :user_id ORDER BY id"
+        ), {"user_id": 1}).all()
+        details = " | ".join(row[-1] for row in plan)
+
+        # Assert
+        assert "USING INDEX ix_giftees_user_id" in details
+        assert "TEMP B-TREE" not in details, "ORDER BY id should be served by the index"
+
 
 # =============================================================================
 # INTEGRATION TEST CLASS
@@ -725,18 +877,21 @@ class TestGifteeWorkflows:
         This ensures user isolation and correct calculations
         when multiple users use the app simultaneously.
         """
-        # Create 2 users with different giftees
-        user1 = UserFactory.create(db_session, email="user1@budget.test")
-        user2 = UserFactory.create(db_session, email="user2@budget.test")
+        # Create 2 users (one INSERT) with different giftees
+        user1, user2 = UserFactory.create_batch(db_session, count=2)
 
         # User 1: 3 giftees with budgets totaling $300
-        GifteeRepository.create_giftee(db_session, user1.id, "Mom", budget=100.0)
-        GifteeRepository.create_giftee(db_session, user1.id, "Dad", budget=100.0)
-        GifteeRepository.create_giftee(db_session, user1.id, "Sister", budget=100.0)
+        GifteeFactory.bulk_create(db_session, user1.id, [
+            {"name": "Mom", "budget": 100.0},
+            {"name": "Dad", "budget": 100.0},
+            {"name": "Sister", "budget": 100.0}
+        ])
 
         # User 2: 2 giftees with budgets totaling $150
-        GifteeRepository.create_giftee(db_session, user2.id, "Friend", budget=75.0)
-        GifteeRepository.create_giftee(db_session, user2.id, "Coworker", budget=75.0)
+        GifteeFactory.bulk_create(db_session, user2.id, [
+            {"name": "Friend", "budget": 75.0},
+            {"name": "Coworker", "budget": 75.0}
+        ])
 
         # Verify correct totals for each user
         user1_total = GifteeRepository.get_total_budget(db_session, user1.id)
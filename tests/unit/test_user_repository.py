@@ -29,6 +29,7 @@ Author: Holiday Gifting Dashboard Team
 Purpose: Educational testing example for CS students
 """
 
+import bcrypt
 import pytest
 from app.repository import UserRepository
 from app.models import User
@@ -391,6 +392,31 @@ class TestPasswordVerification:
         assert is_valid is False, \
             f"Password '{wrong_password}' should be rejected (not equal to '{correct_password}')"
 
+    def test_verify_many_checks_each_pair(self):
+        """
+        Test verifying a batch of passwords at once.
+
+        LEARNING: Parallel Work
+        =======================
+        bcrypt is slow ON PURPOSE, so checking hundreds of passwords one
+        after another (say, during a bulk import) adds up. verify_many()
+        spreads the checks over a thread pool - bcrypt releases Python's
+        GIL while hashing, so threads really do run in parallel.
+
+        Results must still come back in the same order as the input!
+        """
+        # Arrange: Cheap hashes (rounds=4) keep the test fast
+        hash_a = bcrypt.hashpw(b"alpha", bcrypt.gensalt(rounds=4)).decode('utf-8')
+        hash_b = bcrypt.hashpw(b"bravo", bcrypt.gensalt(rounds=4)).decode('utf-8')
+        pairs = [("alpha", hash_a), ("wrong", hash_a), ("bravo", hash_b)]
+
+        # Act
+        results = UserRepository.verify_many(pairs)
+
+        # Assert
+        assert results == [True, False, True]
+        assert UserRepository.verify_many([]) == []
+
 
 # =============================================================================
 # TEST CLASS: User Existence Check